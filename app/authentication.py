@@ -5,13 +5,19 @@ Centralizes the logic for creating, decoding, and validating tokens.
 
 import os
 import datetime
-from typing import Union
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, Union
 
 import bcrypt
 import jwt
 from dotenv import load_dotenv
 from rich.console import Console
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.models import Employee
 
@@ -24,13 +30,35 @@ SECRET_KEY = os.getenv(
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 3
 
+# bcrypt cost factor (2^rounds iterations), tunable per deployment via BCRYPT_ROUNDS.
+# Verification reuses the cost stored in each hash, so existing hashes stay valid.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Verified token payloads, keyed by SHA-256(token) (the raw token is never stored).
+TOKEN_CACHE_TTL_SECONDS = 10
+TOKEN_CACHE_MAX_SIZE = 1024
+_token_cache: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 
 def hash_password(password: str) -> str:
-    """Hashes a plain password using bcrypt."""
-    hashed_bytes = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    """Hashes a plain password using bcrypt with the BCRYPT_ROUNDS cost factor."""
+    hashed_bytes = bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    )
     return hashed_bytes.decode("utf-8")
 
 
+@functools.lru_cache(maxsize=1)
+def dummy_password_hash() -> str:
+    """
+    Returns a throwaway bcrypt hash (computed once, on first use).
+    Checking a password against it when the email is unknown keeps a failed login
+    as slow as a real one, so response time does not reveal which emails exist.
+    """
+    return hash_password("epic-events-dummy-password")
+
+
 def check_password(password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
     try:
@@ -80,11 +108,80 @@ def decode_access_token(token: str) -> Union[dict, None]:
         return None
 
 
+def _token_cache_key(token: str) -> bytes:
+    """Returns the cache key of a token: its SHA-256 digest."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def get_cached_token_payload(token: str) -> Union[dict, None]:
+    """
+    Returns the payload of a recently verified token, or None on a cache miss
+    (unknown token, cache entry older than the TTL, or token expired).
+    """
+    key = _token_cache_key(token)
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        payload, valid_until = entry
+        if valid_until <= time.time():
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return payload
+
+
+def cache_token_payload(token: str, payload: dict) -> None:
+    """
+    Stores a verified payload (sub, department, exp) for min(exp, TTL).
+    Only call this after a successful decode_access_token.
+    """
+    valid_until = min(float(payload["exp"]), time.time() + TOKEN_CACHE_TTL_SECONDS)
+    cached = {
+        "sub": payload.get("sub"),
+        "department": payload.get("department"),
+        "exp": payload["exp"],
+    }
+    key = _token_cache_key(token)
+    with _token_cache_lock:
+        _token_cache[key] = (cached, valid_until)
+        _token_cache.move_to_end(key)
+        if len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def verify_token_offline(token: str) -> Union[dict, None]:
+    """
+    Verifies the token signature and expiry locally, without any DB access.
+    Returns the claims (sub, department, exp), or None if the token is invalid.
+    """
+    payload = get_cached_token_payload(token)
+
+    if payload is None:
+        payload = decode_access_token(token)
+
+        if payload is None:
+            return None
+
+        cache_token_payload(token, payload)
+
+    return payload
+
+
+def invalidate_cached_token(token: str | None) -> None:
+    """Drops a token from the verified-payload cache (e.g. on logout)."""
+    if token is None:
+        return
+    with _token_cache_lock:
+        _token_cache.pop(_token_cache_key(token), None)
+
+
 def get_employee_from_token(token: str, session: Session) -> Employee | None:
     """
     Decode the token, valide is user exist in the DB, and manage refresh.
+    A token verified less than TOKEN_CACHE_TTL_SECONDS ago skips the signature check.
     """
-    payload = decode_access_token(token)
+    payload = verify_token_offline(token)
 
     if payload is None:
         return None
@@ -98,7 +195,9 @@ def get_employee_from_token(token: str, session: Session) -> Employee | None:
         )
         return None
 
-    employee = session.query(Employee).filter_by(id=int(employee_id)).one_or_none()
+    employee = session.get(
+        Employee, int(employee_id), options=[joinedload(Employee.role)]
+    )
 
     if employee is None:
         console.print(
@@ -168,9 +267,16 @@ PERMISSIONS = {
 }
 
 
+def get_employee_permissions(department: str) -> Mapping[str, bool]:
+    """
+    Returns the read-only permission table of a department (empty if unknown).
+    """
+    return MappingProxyType(PERMISSIONS.get(department, {}))
+
+
 def check_permission(employee, action: str) -> bool:
     """
     Checks if the employee has permission to perform the given action.
     """
-    department = employee.department
-    return PERMISSIONS.get(department, {}).get(action, False)
+    permissions = get_employee_permissions(employee.department)
+    return permissions.get(action, False)
@@ -88,7 +88,10 @@ def list_contracts(
     """
     Lists all Contracts based on user permissions and optional filters.
     """
-    query = session.query(Contract).options(joinedload(Contract.client))
+    # Client and sales contact are displayed for every row: loaded in the same query
+    query = session.query(Contract).options(
+        joinedload(Contract.client), joinedload(Contract.sales_contact)
+    )
 
     if current_user.department == "Commercial":
         query = query.join(Client).filter(Client.sales_contact_id == current_user.id)
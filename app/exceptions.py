@@ -0,0 +1,10 @@
+"""
+Application-level exceptions shared between the menus (View layer) and main.py.
+"""
+
+
+class SystemExitRequested(Exception):
+    """
+    Raised by a department menu when the user chooses to quit the application.
+    main() catches it to close the session and dispose of the engine before exiting.
+    """
@@ -11,16 +11,20 @@ import datetime
 from dotenv import load_dotenv
 from sqlalchemy import (
     create_engine,
+    inspect,
     Column,
     Integer,
     String,
     Numeric,
     Boolean,
     ForeignKey,
+    Index,
     Text,
     TIMESTAMP,
+    func,
 )
-from sqlalchemy.orm import relationship, declarative_base, Session
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.orm import relationship, declarative_base, validates, Session
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.exc import IntegrityError
 from rich.console import Console
@@ -46,7 +50,17 @@ DATABASE_URL = (
     f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_ADDRESS}:5432/{POSTGRES_DB}"
 )
 
-engine = create_engine(DATABASE_URL)
+# Single engine for the whole process: its connection pool is shared by every session.
+# Connections are checked before use and recycled after an hour so an idle CLI
+# does not hit a connection the server has already closed.
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_size=5,
+    max_overflow=5,
+    pool_timeout=10,
+)
 Base = declarative_base()
 
 
@@ -68,17 +82,29 @@ class Employee(Base):
     __tablename__ = "employees"
     id = Column(Integer, primary_key=True)
     full_name = Column(String(100), nullable=False)
-    email = Column(String(100), unique=True, nullable=False)
+    # Stored lowercase (see normalize_email). Login matches lower(email), served by the
+    # unique ix_employees_email_lower index below, so rows written in mixed case before
+    # the normalization can still log in (and cannot differ only by case).
+    email = Column(String(100), unique=True, index=True, nullable=False)
     phone = Column(String(20))
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     _password = Column("password_hash", String(128), nullable=False)
 
+    __table_args__ = (
+        Index("ix_employees_email_lower", func.lower(email), unique=True),
+    )
+
     # Relationships
     role = relationship("Role", back_populates="employees")
     clients_assigned = relationship("Client", back_populates="sales_contact")
     contracts_assigned = relationship("Contract", back_populates="sales_contact")
     events_support = relationship("Event", back_populates="support_contact")
 
+    @validates("email")
+    def normalize_email(self, key, email):
+        """Stores emails trimmed and lowercase: login lowercases the entered email."""
+        return email.strip().lower() if email is not None else email
+
     @property
     def department(self):
         """Helper to get department name (Role name)."""
@@ -183,24 +209,52 @@ class Event(Base):
 
 
 # --- Initialisation de la base de données ---
+DEPARTMENT_ROLES = ("Gestion", "Commercial", "Support")
+
+
+def is_database_initialized(session: Session, engine_instance) -> bool:
+    """
+    Fast startup guard: True when every mapped table and the login index exist (two
+    catalog queries), all three department roles are present and at least one
+    employee can log in, in which case create_all() and initialize_roles() can be
+    skipped. A partially seeded database (e.g. roles committed but the default admin
+    never created) returns False.
+    """
+    inspector = inspect(engine_instance)
+    if not set(inspector.get_table_names()).issuperset(Base.metadata.tables):
+        return False
+    if not inspector.has_index("employees", "ix_employees_email_lower"):
+        return False
+    role_count = session.query(Role.id).filter(Role.name.in_(DEPARTMENT_ROLES)).count()
+    if role_count != len(DEPARTMENT_ROLES):
+        return False
+    return session.query(Employee.id).limit(1).first() is not None
+
+
 def initialize_roles(session: Session, engine_instance) -> None:
     """
     Ensures essential roles (Gestion, Commercial, Support) and a default Admin
     user are present in the database.
     """
     Base.metadata.create_all(engine_instance)
-
-    roles_to_create = ["Gestion", "Commercial", "Support"]
-    roles_created = 0
-    for role_name in roles_to_create:
-        if not session.query(Role).filter_by(name=role_name).first():
-            new_role = Role(name=role_name)
-            session.add(new_role)
-            roles_created += 1
-
-    if roles_created > 0:
+    # create_all() skips existing tables: adds indexes missing from older databases
+    # (e.g. ix_employees_email_lower). IF NOT EXISTS rather than checkfirst, since
+    # not every dialect reflects expression-based indexes.
+    with engine_instance.begin() as connection:
+        for index in Employee.__table__.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+    # One IN query for the existing roles, then one bulk insert for the missing ones
+    existing_roles = {
+        name
+        for (name,) in session.query(Role.name).filter(Role.name.in_(DEPARTMENT_ROLES))
+    }
+    missing_roles = [name for name in DEPARTMENT_ROLES if name not in existing_roles]
+
+    if missing_roles:
+        session.bulk_save_objects([Role(name=name) for name in missing_roles])
         console.print(
-            f"[bold green]Roles created in database: {', '.join(roles_to_create)}.[/bold green]"
+            f"[bold green]Roles created in database: {', '.join(missing_roles)}.[/bold green]"
         )
     else:
         console.print("[bold green]Roles verified in database.[/bold green]")
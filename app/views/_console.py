@@ -0,0 +1,25 @@
+"""
+Shared Rich console and rendering helpers for the CLI (View layer).
+A single Console instance means the terminal is probed only once at startup.
+"""
+
+from enum import Enum
+
+from rich.console import Console
+
+console = Console()
+
+
+class RenderMode(Enum):
+    """How a menu is drawn before its next prompt."""
+
+    FULL = "full"  # Full dashboard (banner + all options)
+    COMPACT = "compact"  # Prompt only, keeps the last listing on screen
+
+
+def employee_header(employee) -> str:
+    """Returns the 'User: <name> (ID: <id>, Dept: <department>)' dashboard header."""
+    return (
+        f"User: [cyan]{employee.full_name}[/cyan] "
+        f"(ID: {employee.id}, Dept: [yellow]{employee.department}[/yellow])"
+    )
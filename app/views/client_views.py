@@ -2,7 +2,6 @@
 Client Views: CLI functions for client management by the sales team.
 """
 
-from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 
@@ -12,7 +11,7 @@ from app.controllers.utils import is_valid_email, is_valid_phone
 
 from app.controllers.employee_controller import list_employees
 
-console = Console()
+from ._console import console
 
 
 # --- Display Functions ---
@@ -1,4 +1,3 @@
-from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from decimal import Decimal
@@ -13,7 +12,7 @@ from app.controllers.contract_controller import (
 )
 from app.controllers.employee_controller import list_employees
 
-console = Console()
+from ._console import console
 
 
 def display_contract_table(contracts: List[Contract], title: str):
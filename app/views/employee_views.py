@@ -3,7 +3,6 @@ Employee Views: Handles all user interface (CLI) interactions for Employee CRUD
 It calls the pure business logic functions from the controller layer.
 """
 
-from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 
@@ -21,7 +20,7 @@ import app.authentication as auth
 
 from app.models import Employee  # Garder l'importation du modèle pour le type hinting
 
-console = Console()
+from ._console import console
 
 # --- Utility Functions (Display) ---
 
@@ -2,7 +2,6 @@
 Event Views: Fonctions CLI pour la gestion des événements.
 """
 
-from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from datetime import datetime
@@ -19,7 +18,7 @@ from app.controllers.employee_controller import (
     list_employees,
 )  # Pour l'assignation de support
 
-console = Console()
+from ._console import console
 
 
 def display_event_table(events: List[Event], title: str):
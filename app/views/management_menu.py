@@ -3,10 +3,9 @@ Management menu interface (View layer).
 Handles routing for Employee, Contract, and Event operations for the Management department (Gestion).
 """
 
-import sys
-from rich.console import Console
-from rich.prompt import Prompt
+from rich.text import Text
 from sqlalchemy.orm import Session
+from app.exceptions import SystemExitRequested
 from app.models import Employee
 
 # CRITICAL IMPORT: Authentication
@@ -33,7 +32,33 @@ from .event_views import (
     update_event_cli,
 )
 
-console = Console()
+from ._console import console, employee_header
+
+# Static menu lines are parsed from markup once, at import time.
+_MANAGEMENT_SEPARATOR = Text("=" * 50, style="bold magenta")
+_MANAGEMENT_MENU_LINES = tuple(
+    Text.from_markup(line)
+    for line in (
+        "[bold underline]EMPLOYEE MANAGEMENT[/bold underline]",
+        "1. [green]Create[/green] a new Employee",
+        "2. [blue]List[/blue] all Employees",
+        "3. [yellow]Update[/yellow] an Employee",
+        "4. [red]Delete[/red] an Employee",
+        # CONTRACT MANAGEMENT - New option 5 added, shifting others
+        "\n[bold underline]CONTRACT MANAGEMENT[/bold underline]",
+        "5. [blue]List[/blue] Contracts",
+        "6. [green]Create[/green] a new Contract",
+        "7. [yellow]Update[/yellow] a Contract",
+        # EVENT MANAGEMENT
+        "\n[bold underline]EVENT MANAGEMENT[/bold underline]",
+        "8. [blue]List[/blue] Events (with filters)",
+        "9. [yellow]Update[/yellow] an Event",
+        "--------------------------------------",
+        "10. [bold]Logout[/bold] (Return to Login)",
+        "11. [bold red]Quit[/bold red] Application",
+    )
+)
+_MANAGEMENT_CHOICES = frozenset(str(i) for i in range(1, 12))
 
 
 def display_management_menu(employee: Employee):
@@ -41,37 +66,18 @@ def display_management_menu(employee: Employee):
     Displays the menu options for the Management department.
     Updated to include contract listing.
     """
-    department_name = employee.department
-
     # Style unchanged
-    console.print("\n" + "=" * 50, style="bold magenta")
+    console.print()
+    console.print(_MANAGEMENT_SEPARATOR)
     console.print(
-        f"[bold magenta]MANAGEMENT DASHBOARD[/bold magenta] | User: [cyan]{employee.full_name}[/cyan] (ID: {employee.id}, Dept: [yellow]{department_name}[/yellow])"
+        f"[bold magenta]MANAGEMENT DASHBOARD[/bold magenta] | {employee_header(employee)}"
     )
-    console.print("=" * 50, style="bold magenta")
-
-    console.print("[bold underline]EMPLOYEE MANAGEMENT[/bold underline]")
-    console.print("1. [green]Create[/green] a new Employee")
-    console.print("2. [blue]List[/blue] all Employees")
-    console.print("3. [yellow]Update[/yellow] an Employee")
-    console.print("4. [red]Delete[/red] an Employee")
+    console.print(_MANAGEMENT_SEPARATOR)
 
-    # CONTRACT MANAGEMENT - New option 5 added, shifting others
-    console.print("\n[bold underline]CONTRACT MANAGEMENT[/bold underline]")
-    console.print("5. [blue]List[/blue] Contracts")
-    console.print("6. [green]Create[/green] a new Contract")
-    console.print("7. [yellow]Update[/yellow] a Contract")
+    for line in _MANAGEMENT_MENU_LINES:
+        console.print(line)
 
-    # EVENT MANAGEMENT
-    console.print("\n[bold underline]EVENT MANAGEMENT[/bold underline]")
-    console.print("8. [blue]List[/blue] Events (with filters)")
-    console.print("9. [yellow]Update[/yellow] an Event")
-
-    console.print("--------------------------------------")
-    console.print("10. [bold]Logout[/bold] (Return to Login)")
-    console.print("11. [bold red]Quit[/bold red] Application")
-
-    console.print("=" * 50, style="bold magenta")
+    console.print(_MANAGEMENT_SEPARATOR)
 
 
 def management_menu(
@@ -88,9 +94,12 @@ def management_menu(
         display_management_menu(employee)
 
         # Get choice (range 1-11)
-        choice = Prompt.ask(
-            "Select an option [1-11]", choices=[str(i) for i in range(1, 12)]
-        ).strip()
+        choice = input("Select an option [1-11]: ").strip()
+        if choice not in _MANAGEMENT_CHOICES:
+            console.print(
+                "[bold red]Invalid choice. Please select an option from 1 to 11.[/bold red]"
+            )
+            continue
 
         # JWT Security Check
         if get_employee_from_token(token, session) is None:
@@ -137,12 +146,6 @@ def management_menu(
             return "logout", None
         elif choice == "11":
             console.print("[bold red]Quitting application...[/bold red]")
-            sys.exit(0)
-
-        # Error handling
-        else:
-            console.print(
-                "[bold red]Invalid choice. Please select an option from 1 to 11.[/bold red]"
-            )
+            raise SystemExitRequested()
 
         return "stay", token
@@ -4,10 +4,9 @@ Handles routing for Client, Contract, and Event operations specific to Commercia
 and includes JWT expiration check.
 """
 
-import sys
-from rich.console import Console
-from rich.prompt import Prompt
+from rich.text import Text
 from sqlalchemy.orm import Session
+from app.exceptions import SystemExitRequested
 from app.models import Employee  # Pour le type hinting
 
 # Import des fonctions d'authentification
@@ -29,43 +28,49 @@ from .event_views import (
     list_events_cli,
 )
 
-console = Console()
+from ._console import RenderMode, console, employee_header
+
+# Lignes statiques du menu, parsées une seule fois à l'import
+_SALES_SEPARATOR = Text("=" * 50, style="bold yellow")
+_SALES_MENU_LINES = tuple(
+    Text.from_markup(line)
+    for line in (
+        "[bold underline]CLIENTS[/bold underline]",
+        "1. [green]Create[/green] a new Client",
+        "2. [blue]List[/blue] Clients",
+        "3. [yellow]Update[/yellow] a Client",
+        "\n[bold underline]CONTRACTS[/bold underline]",
+        "4. [blue]List[/blue] Contracts",
+        "5. [yellow]Update[/yellow] a Contract (Your clients only)",
+        "\n[bold underline]EVENTS[/bold underline]",
+        "6. [green]Create[/green] an Event (For a signed contract of your client)",
+        "7. [blue]List[/blue] Events",
+        "--------------------------------------",
+        "8. [bold]Logout[/bold] (Return to Login)",
+        "9. [bold red]Quit[/bold red] Application",
+    )
+)
+# Options de lecture seule : le tableau affiché reste à l'écran (prompt compact)
+_SALES_READ_ONLY_CHOICES = frozenset({"2", "4", "7"})
+_SALES_CHOICES = frozenset(str(i) for i in range(1, 10))
 
 
 def display_sales_menu(employee: Employee):
     """
     Displays the menu options for the Commercial department based on user's new structure.
     """
-    department_name = employee.department
-
     # Style demandé par l'utilisateur (Intact)
-    console.print("\n" + "=" * 50, style="bold yellow")
+    console.print()
+    console.print(_SALES_SEPARATOR)
     console.print(
-        f"[bold yellow]SALES DASHBOARD[/bold yellow] | User: [cyan]{employee.full_name}[/cyan] (ID: {employee.id}, Dept: [yellow]{department_name}[/yellow])"
+        f"[bold yellow]SALES DASHBOARD[/bold yellow] | {employee_header(employee)}"
     )
-    console.print("=" * 50, style="bold yellow")
-
-    console.print("[bold underline]CLIENTS[/bold underline]")
-    console.print("1. [green]Create[/green] a new Client")
-    console.print("2. [blue]List[/blue] Clients")
-    console.print("3. [yellow]Update[/yellow] a Client")
-
-    console.print("\n[bold underline]CONTRACTS[/bold underline]")
-    console.print("4. [blue]List[/blue] Contracts")
-    console.print("5. [yellow]Update[/yellow] a Contract (Your clients only)")
-
-    console.print("\n[bold underline]EVENTS[/bold underline]")
-    console.print(
-        "6. [green]Create[/green] an Event (For a signed contract of your client)"
-    )
-    console.print("7. [blue]List[/blue] Events")
-
-    console.print("--------------------------------------")
+    console.print(_SALES_SEPARATOR)
 
-    console.print("8. [bold]Logout[/bold] (Return to Login)")
-    console.print("9. [bold red]Quit[/bold red] Application")
+    for line in _SALES_MENU_LINES:
+        console.print(line)
 
-    console.print("=" * 50, style="bold yellow")
+    console.print(_SALES_SEPARATOR)
 
 
 # Signature de fonction correcte pour main.py
@@ -75,13 +80,22 @@ def sales_menu(
     """
     Main loop and router for the Sales department menu.
     """
+    render_mode = RenderMode.FULL
+
     while True:
 
-        # 1. Afficher le menu
-        display_sales_menu(employee)
+        # 1. Afficher le menu (sauf après un simple listing)
+        if render_mode is RenderMode.FULL:
+            display_sales_menu(employee)
 
         # 2. Récupérer le choix (plage 1-9)
-        choice = Prompt.ask("Select an option [1-9]").strip()
+        choice = input("Select an option [1-9]: ").strip()
+        if choice not in _SALES_CHOICES:
+            console.print(
+                "[bold red]Invalid choice. Please select an option from 1 to 9.[/bold red]"
+            )
+            render_mode = RenderMode.FULL
+            continue
 
         # FIX HOMOGÉNÉITÉ (JWT): Vérification APRES le choix (comme Support/Gestion)
         if get_employee_from_token(token, session) is None:
@@ -91,6 +105,12 @@ def sales_menu(
             # Retourne None pour le token car il est expiré
             return "logout", None
 
+        render_mode = (
+            RenderMode.COMPACT
+            if choice in _SALES_READ_ONLY_CHOICES
+            else RenderMode.FULL
+        )
+
         # 3. ROUTAGE MIS À JOUR (1-9)
 
         # --- CLIENTS ---
@@ -120,13 +140,7 @@ def sales_menu(
             return "logout", None
         elif choice == "9":
             console.print("[bold red]Quitting application...[/bold red]")
-            sys.exit(0)
-
-        # Gestion de l'erreur
-        else:
-            console.print(
-                "[bold red]Invalid choice. Please select an option from 1 to 9.[/bold red]"
-            )
+            raise SystemExitRequested()
 
         # FIX RETOUR: Suppression de la logique de rafraîchissement explicite.
         # La boucle principale de main.py est responsable de rafraîchir le jeton
@@ -3,12 +3,11 @@ Support menu interface (View layer).
 Handles routing for read and specific update operations for the Support department.
 """
 
-import sys
-from rich.console import Console
-from rich.prompt import Prompt
+from rich.text import Text
 from sqlalchemy.orm import Session  # Import de Session pour le type hinting
 
 from app.authentication import get_employee_from_token  # Pour la vérification de token
+from app.exceptions import SystemExitRequested
 from app.models import Employee  # Pour le type hinting
 
 # Import des vues CRUD (Note: Support n'a que la lecture sur Clients/Contrats)
@@ -16,33 +15,42 @@ from .client_views import list_clients_cli
 from .contract_views import list_contracts_cli
 from .event_views import list_events_cli, update_event_cli
 
-console = Console()
+from ._console import RenderMode, console, employee_header
+
+# Lignes statiques du menu, parsées une seule fois à l'import
+_SUPPORT_SEPARATOR = Text("=" * 50, style="bold blue")
+_SUPPORT_MENU_LINES = tuple(
+    Text.from_markup(line)
+    for line in (
+        "[bold underline]READ ACCESS (All Entities)[/bold underline]",
+        "1. [blue]List[/blue] all Clients",
+        "2. [blue]List[/blue] all Contracts",
+        "\n[bold underline]EVENTS MANAGEMENT[/bold underline]",
+        "3. [blue]List[/blue] Events (with filters)",
+        "4. [yellow]Update[/yellow] an Event (Assigned Events only)",
+        "---------------------------------------",
+        "5. [bold]Logout[/bold] (Return to Login)",
+        "6. [bold red]Quit[/bold red] Application",
+    )
+)
+# Options de lecture seule : le tableau affiché reste à l'écran (prompt compact)
+_SUPPORT_READ_ONLY_CHOICES = frozenset({"1", "2", "3"})
+_SUPPORT_CHOICES = frozenset(str(i) for i in range(1, 7))
 
 
 def display_support_menu(employee: Employee):
     """
     Displays the menu options for the Support department.
     """
-    department_name = employee.department
-
-    console.print("\n" + "=" * 50, style="bold blue")
+    console.print()
+    console.print(_SUPPORT_SEPARATOR)
     console.print(
-        f"[bold blue]SUPPORT DASHBOARD[/bold blue] | User: [cyan]{employee.full_name}[/cyan] (ID: {employee.id}, Dept: [yellow]{department_name}[/yellow])"
+        f"[bold blue]SUPPORT DASHBOARD[/bold blue] | {employee_header(employee)}"
     )
-    console.print("=" * 50, style="bold blue")
-
-    console.print("[bold underline]READ ACCESS (All Entities)[/bold underline]")
-    console.print("1. [blue]List[/blue] all Clients")
-    console.print("2. [blue]List[/blue] all Contracts")
+    console.print(_SUPPORT_SEPARATOR)
 
-    console.print("\n[bold underline]EVENTS MANAGEMENT[/bold underline]")
-    console.print("3. [blue]List[/blue] Events (with filters)")
-    console.print("4. [yellow]Update[/yellow] an Event (Assigned Events only)")
-
-    console.print("---------------------------------------")
-
-    console.print("5. [bold]Logout[/bold] (Return to Login)")
-    console.print("6. [bold red]Quit[/bold red] Application")
+    for line in _SUPPORT_MENU_LINES:
+        console.print(line)
 
 
 # CORRECTION CRITIQUE: L'ordre des arguments est inversé pour correspondre à main.py
@@ -52,14 +60,19 @@ def support_menu(
     """
     Main loop for the Support menu.
     """
+    render_mode = RenderMode.FULL
+
     while True:
-        # 1. Affichage du menu
-        display_support_menu(employee)
+        # 1. Affichage du menu (sauf après un simple listing)
+        if render_mode is RenderMode.FULL:
+            display_support_menu(employee)
 
         # 2. Récupération du choix
-        choice = Prompt.ask(
-            "Select an option [1-6]", choices=[str(i) for i in range(1, 7)]
-        )
+        choice = input("Select an option [1-6]: ").strip()
+        if choice not in _SUPPORT_CHOICES:
+            console.print("[bold red]Invalid choice. Please try again.[/bold red]")
+            render_mode = RenderMode.FULL
+            continue
         action_performed = False
 
         # --- VÉRIFICATION DE SÉCURITÉ JWT ---
@@ -69,6 +82,12 @@ def support_menu(
             )
             return "logout", None  # Retourne None pour le token car il est expiré
 
+        render_mode = (
+            RenderMode.COMPACT
+            if choice in _SUPPORT_READ_ONLY_CHOICES
+            else RenderMode.FULL
+        )
+
         # --- ROUTEUR ---
         if choice == "1":
             list_clients_cli(session, employee)
@@ -84,9 +103,7 @@ def support_menu(
             return "logout", None  # Retourne None pour le token
         elif choice == "6":
             console.print("[bold red]Quitting application...[/bold red]")
-            sys.exit(0)
-        else:
-            console.print("[bold red]Invalid choice. Please try again.[/bold red]")
+            raise SystemExitRequested()
 
         # 3. Logique de renouvellement du token (si une action a été effectuée ou simplement pour la cohérence)
         if action_performed:
@@ -0,0 +1,33 @@
+# benchmarks/conftest.py
+from types import SimpleNamespace
+from unittest.mock import Mock
+import pytest
+from app import authentication
+from app.models import Employee, Role
+from tests.helpers import FakeQuery, FakeSession, fake_check_password, fake_hash_password
+
+
+@pytest.fixture(autouse=True)
+def no_bcrypt(mocker):
+    # Measure the controllers, not bcrypt's cost factor. Same fakes and targets as
+    # no_bcrypt in tests/conftest.py, which is not loaded for benchmarks/.
+    mocker.patch.object(authentication, "hash_password", new=fake_hash_password)
+    mocker.patch.object(authentication, "check_password", new=fake_check_password)
+
+
+@pytest.fixture
+def gestion_user():
+    return Mock(id=1, department='Gestion')
+
+
+@pytest.fixture
+def target_employee():
+    return Employee(id=2, full_name='Sales User', email='sales@e.com', phone='0000000000', role_id=2)
+
+
+@pytest.fixture
+def mock_session(target_employee):
+    session = FakeSession()
+    session.queries[Role] = FakeQuery(one_or_none=SimpleNamespace(id=2, name='Commercial'))
+    session.queries[Employee] = FakeQuery(one_or_none=target_employee, all=[target_employee] * 50)
+    return session
@@ -0,0 +1,19 @@
+# benchmarks/test_employee_bench.py
+from app.controllers.employee_controller import create_employee, list_employees, update_employee
+
+
+def test_bench_create_employee(benchmark, mock_session, gestion_user):
+    employee = benchmark(create_employee, mock_session, gestion_user, 'New Employee',
+                         'new.employee@epicevents.com', '0123456789', 'Commercial', 'pass')
+    assert employee is not None
+
+
+def test_bench_update_employee(benchmark, mock_session, gestion_user):
+    employee = benchmark(update_employee, mock_session, gestion_user, 2,
+                         full_name='Renamed User', phone='0987654321')
+    assert employee.full_name == 'Renamed User'
+
+
+def test_bench_list_employees(benchmark, mock_session):
+    employees = benchmark(list_employees, mock_session)
+    assert len(employees) == 50
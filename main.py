@@ -4,50 +4,144 @@ It handles user authentication using JWT and routes to different functionalities
 based on user permissions.
 """
 
+import functools
+import getpass
 import os
 import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from dotenv import load_dotenv
-import sentry_sdk
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
-from rich.console import Console
-from rich.prompt import Prompt
-from sqlalchemy.orm import sessionmaker
-
-from app.models import Employee, Base, engine, initialize_roles
+from sqlalchemy import bindparam, func, select
+from rich.text import Text
+from sqlalchemy.orm import joinedload, scoped_session, sessionmaker
+
+from app.exceptions import SystemExitRequested
+from app.models import (
+    Employee,
+    engine,
+    initialize_roles,
+    is_database_initialized,
+)
 from app.authentication import (
     check_password,
     create_access_token,
+    dummy_password_hash,
     get_employee_from_token,
+    invalidate_cached_token,
+    verify_token_offline,
 )
-from app.views.management_menu import management_menu
-from app.views.sales_menu import sales_menu
-from app.views.support_menu import support_menu
+from app.views._console import console
+
+# Computed once (a single abspath call); only appended if missing.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+
+_DATABASE_ENV_VARS = ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB", "POSTGRES_ADDRESS")
+
+# Last .env file parsed by load_env_file(): not re-parsed while its mtime is unchanged.
+_ENV_CACHE: dict = {"path": None, "mtime": None, "loaded": False}
+
+# Set by init_sentry() once the SDK is initialized with a DSN. While it is False,
+# report_exc() and flush_sentry() return at once and sentry_sdk is never imported.
+_SENTRY_ENABLED = False
+
+# Identical exceptions (same source, type and message) are sent to Sentry at most
+# _CAPTURE_MAX_PER_WINDOW times per window; the others are only counted.
+_CAPTURE_WINDOW_SECONDS = 60.0
+_CAPTURE_MAX_PER_WINDOW = 5
+_CAPTURE_MAX_KEYS = 128
+# key -> [window start (monotonic), events sent, events suppressed]
+_recent_captures: OrderedDict[tuple[str, str, str], list] = OrderedDict()
+
+# Session factory built once at import and bound to the pooled engine from app.models.
+# expire_on_commit=False: committed objects (e.g. the logged-in employee) are not
+# reloaded on next access. get_session() returns the current session from the
+# SessionLocal registry; SessionLocal.remove() ends it.
+SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
+SessionLocal = scoped_session(SessionFactory)
+
+# Login banner built once, printed on every login attempt.
+_LOGIN_BANNER = Text.assemble(
+    ("\n" + "=" * 50 + "\n", "bold blue"),
+    ("EPIC EVENTS CRM LOGIN\n", "bold blue"),
+    ("=" * 50, "bold blue"),
+)
+
+# Login lookup built once: its compiled form is reused from SQLAlchemy's cache.
+# The role is loaded in the same query (employee.department is read right after login).
+_LOGIN_STMT = (
+    select(Employee)
+    .options(joinedload(Employee.role))
+    # New emails are stored lowercase (Employee.normalize_email), but rows written
+    # before that may be mixed case: lower(email) is served by the unique
+    # ix_employees_email_lower index, so this stays an index lookup with one match.
+    .where(func.lower(Employee.email) == bindparam("email"))
+)
+
+
+# --- Lazy imports: menus are loaded the first time their department logs in ---
+
+
+@functools.lru_cache(maxsize=None)
+def _management_menu():
+    """Imports the Management menu on first use."""
+    from app.views.management_menu import management_menu
+
+    return management_menu
+
+
+@functools.lru_cache(maxsize=None)
+def _sales_menu():
+    """Imports the Sales menu on first use."""
+    from app.views.sales_menu import sales_menu
+
+    return sales_menu
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.abspath(os.path.join(current_dir, ".."))
-if project_root not in sys.path:
-    sys.path.append(project_root)
 
-console = Console()
+@functools.lru_cache(maxsize=None)
+def _support_menu():
+    """Imports the Support menu on first use."""
+    from app.views.support_menu import support_menu
 
-GLOBAL_JWT_TOKEN: str | None = None
+    return support_menu
+
+
+# Department -> menu loader
+_MENU_DISPATCH = {
+    "Gestion": _management_menu,
+    "Commercial": _sales_menu,
+    "Support": _support_menu,
+}
 
 
 def init_sentry():
     """Initializes Sentry SDK using DSN from environment variable (SENTRY_DSN)."""
+    global _SENTRY_ENABLED
+
     sentry_dsn = os.environ.get("SENTRY_DSN")
 
     if sentry_dsn:
+        # Imported only when a DSN is configured
+        import sentry_sdk
+        from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+
         sentry_sdk.init(
             dsn=sentry_dsn,
-            traces_sample_rate=1.0,
+            # Only a sample of transactions is traced; errors are always sent.
+            traces_sample_rate=0.05,
+            profiles_sample_rate=0.0,
+            # Bounds how long the exit handler waits for pending events.
+            shutdown_timeout=1,
             environment="cli-prod",
             integrations=[
                 SqlalchemyIntegration(),
             ],
             send_default_pii=False,
         )
+        _SENTRY_ENABLED = True
         console.print("[bold green]Sentry Initialized (DSN found).[/bold green]")
     else:
         console.print(
@@ -56,54 +150,182 @@ def init_sentry():
         )
 
 
+def report_exc(exc: Exception, source: str) -> bool:
+    """
+    Sends the exception to Sentry, unless the same exception was already sent from
+    the same source _CAPTURE_MAX_PER_WINDOW times in the current window. Events keep
+    Sentry's default (stack trace) grouping and carry the source (call site) as the
+    "crm.source" tag; the first event of a new window carries the number of events
+    suppressed in the previous one. Returns True if the event was sent.
+    Without a DSN, returns False straight away (sentry_sdk is never imported).
+    """
+    if not _SENTRY_ENABLED:
+        return False
+
+    import sentry_sdk
+
+    key = (source, type(exc).__name__, str(exc)[:128])
+    now = time.monotonic()
+    entry = _recent_captures.get(key)
+
+    if entry is None or now - entry[0] >= _CAPTURE_WINDOW_SECONDS:
+        suppressed_count = entry[2] if entry is not None else 0
+        entry = [now, 0, 0]
+    else:
+        suppressed_count = 0
+
+    _recent_captures[key] = entry
+    _recent_captures.move_to_end(key)
+    if len(_recent_captures) > _CAPTURE_MAX_KEYS:
+        _recent_captures.popitem(last=False)
+
+    if entry[1] >= _CAPTURE_MAX_PER_WINDOW:
+        entry[2] += 1
+        return False
+
+    entry[1] += 1
+    with sentry_sdk.new_scope() as scope:
+        scope.set_tag("crm.source", source)
+        if suppressed_count:
+            scope.set_tag("suppressed_count", suppressed_count)
+        sentry_sdk.capture_exception(exc)
+    return True
+
+
+def flush_sentry(timeout: float = 1.0) -> None:
+    """Waits up to timeout seconds for the pending Sentry events (no-op without a DSN)."""
+    if _SENTRY_ENABLED:
+        import sentry_sdk
+
+        sentry_sdk.flush(timeout=timeout)
+
+
+def load_env_file(dotenv_path: str) -> bool:
+    """
+    Loads dotenv_path into the environment (variables already set are kept), unless
+    this file was already loaded and has not been modified since.
+    Returns True if the file is loaded.
+    """
+    try:
+        mtime = os.stat(dotenv_path).st_mtime
+    except OSError:
+        return False
+
+    if (
+        _ENV_CACHE["loaded"]
+        and _ENV_CACHE["path"] == dotenv_path
+        and _ENV_CACHE["mtime"] == mtime
+    ):
+        return True
+
+    is_loaded = load_dotenv(dotenv_path, override=False)
+    _ENV_CACHE.update(path=dotenv_path, mtime=mtime, loaded=is_loaded)
+    return is_loaded
+
+
 def get_session():
     """
-    Creates and returns a new SQLAlchemy session. 
-    Every operation (login or menu cycle) must use a new session.
+    Returns the current SQLAlchemy session from the SessionLocal registry.
+    The main loop keeps one session open for the whole run of the application.
+    No connection is opened here: the pooled engine connects on first use.
+    """
+    return SessionLocal()
+
+
+@contextmanager
+def session_scope():
     """
+    Yields the current session; rolls it back if an exception escapes the block,
+    and closes it (removing it from the SessionLocal registry) on exit.
+    """
+    session = get_session()
     try:
-        Session = sessionmaker(bind=engine)
-        return Session()
-    except Exception as e:
-        # Tentative de capture si Sentry est initialisé
-        if sentry_sdk.HUB.get_global_scope().client:
-            sentry_sdk.capture_exception(e)
-        console.print(
-            f"[bold red]ERREUR FATALE lors de la création de la session:[/bold red] {e}"
-        )
-        sys.exit(1)
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        SessionLocal.remove()
+
+
+def _ask(prompt: str, *, password: bool = False) -> str:
+    """
+    Reads one answer: through Rich's Prompt on a terminal, through plain input()/getpass()
+    when stdin is piped (scripts, CI), where prompt styling is of no use.
+    """
+    if not sys.stdin.isatty():
+        return getpass.getpass(f"{prompt}: ") if password else input(f"{prompt}: ")
+
+    # Deferred from module import: only interactive prompts go through Rich
+    from rich.prompt import Prompt
 
+    return Prompt.ask(prompt, password=password)
 
-def login_cli(session) -> Employee | None:
-    """Manages the login interface, validates credentials, and generates a JWT token."""
-    global GLOBAL_JWT_TOKEN
 
-    console.print("\n" + "=" * 50, style="bold blue")
-    console.print("[bold blue]EPIC EVENTS CRM LOGIN[/bold blue]")
-    console.print("=" * 50, style="bold blue")
+def login_cli(session) -> tuple[Employee | None, str | None]:
+    """
+    Manages the login interface, validates credentials, and generates a JWT token.
+    Returns:
+        tuple[Employee | None, str | None]: (employee, token), or (None, None) on failure.
+    """
+    console.print(_LOGIN_BANNER)
+
+    # Same normalization as Employee.email (stored lowercase)
+    email = _ask("Enter your Email").strip().lower()
 
-    email = Prompt.ask("Enter your Email").strip()
-    password = Prompt.ask("Enter your Password", password=True).strip()
+    # Malformed emails are rejected before any DB round-trip or password hashing
+    if "@" not in email or len(email) > 254:
+        console.print("[bold red]ERROR:[/bold red] Invalid email or password.")
+        return None, None
 
-    employee = session.query(Employee).filter_by(email=email).one_or_none()
+    password = _ask("Enter your Password", password=True).strip()
 
-    # LOGIQUE DE CONNEXION RESTAURÉE DE main_trusted.py
-    if employee and employee._password and check_password(password, employee._password):
+    employee = session.execute(_LOGIN_STMT, {"email": email}).scalar_one_or_none()
+
+    # Vérification des identifiants
+    # employees.password_hash is NOT NULL: every employee has a hash to check against
+    if employee and check_password(password, employee._password):
         # Authentification réussie
         token, expiration_display = create_access_token(
             employee.id, employee.department
         )
-        GLOBAL_JWT_TOKEN = token
 
         console.print(
             f"\n[bold green]Welcome {employee.full_name} ({employee.department})![/bold green]"
         )
         console.print(f"[bold dim]Session expires in: {expiration_display}[/bold dim]")
-        return employee
+        return employee, token
 
     # Échec de l'authentification
+    if employee is None:
+        # Same bcrypt cost as a real check: unknown emails are not detectable by timing
+        check_password(password, dummy_password_hash())
+
     console.print("[bold red]ERROR:[/bold red] Invalid email or password.")
-    return None
+    return None, None
+
+
+def resolve_logged_in_employee(
+    token: str, session, employee: Employee | None
+) -> Employee | None:
+    """
+    Returns the employee the token belongs to.
+    The signature is checked locally on every menu tick; the employee loaded at login
+    is reused while the claims still match it, so no query is sent to the DB.
+    """
+    claims = verify_token_offline(token)
+
+    if claims is None:
+        return None
+
+    if (
+        employee is not None
+        and claims.get("sub") == str(employee.id)
+        and claims.get("department") == employee.department
+    ):
+        return employee
+
+    return get_employee_from_token(token, session)
 
 
 def main_menu_router(employee: Employee, session, token: str) -> tuple[str, str | None]:
@@ -114,126 +336,135 @@ def main_menu_router(employee: Employee, session, token: str) -> tuple[str, str
     """
 
     department = employee.department
+    menu_loader = _MENU_DISPATCH.get(department)
 
-    if department == "Gestion":
-        return management_menu(session, employee, token)
-    elif department == "Commercial":
-        return sales_menu(session, employee, token)
-    elif department == "Support":
-        return support_menu(session, employee, token)
-    else:
+    if menu_loader is None:
         console.print(
             f"[bold red]ERROR:[/bold red] Unknown department '{department}'. Logging out."
         )
         return "logout", None
 
+    return menu_loader()(session, employee, token)
+
 
 def main():
     """Main entry point of the application."""
-    global GLOBAL_JWT_TOKEN
-
     base_dir = os.path.dirname(os.path.abspath(__file__))
     dotenv_path = os.path.join(base_dir, "database", ".env")
 
-    try:
-        is_loaded = load_dotenv(dotenv_path)
-
-        if not is_loaded:
-            console.print(
-                f"[bold yellow]WARNING:[/bold yellow] Failed to load .env file from "
-                f"{dotenv_path}. Check file existence and path."
-            )
-        else:
-            console.print(
-                f"[bold green]INFO:[/bold green] .env loaded successfully from "
-                f"{dotenv_path}."
-            )
-
-    except Exception as e:
+    # app.models already loaded database/.env on import (or the variables come from
+    # the environment, e.g. docker/systemd): only parse the file if they are missing.
+    if all(os.environ.get(name) for name in _DATABASE_ENV_VARS):
         console.print(
-            f"[bold red]FATAL WARNING:[/bold red] Error during .env load: {e}"
+            "[bold green]INFO:[/bold green] Database settings found in the environment."
         )
+    else:
+        try:
+            is_loaded = load_env_file(dotenv_path)
+
+            if not is_loaded:
+                console.print(
+                    f"[bold yellow]WARNING:[/bold yellow] Failed to load .env file from "
+                    f"{dotenv_path}. Check file existence and path."
+                )
+            else:
+                console.print(
+                    f"[bold green]INFO:[/bold green] .env loaded successfully from "
+                    f"{dotenv_path}."
+                )
 
-    console.print(
-        "[bold cyan]--- Initializing Database Structure & Roles ---[/bold cyan]"
-    )
-
-    Base.metadata.create_all(engine)
-
-    init_session = get_session()
-
-    try:
-        initialize_roles(init_session, engine)
-    except Exception as e:
-        if sentry_sdk.HUB.get_global_scope().client:
-            sentry_sdk.capture_exception(e)
-            sentry_sdk.flush(timeout=1.0)
-        console.print(
-            f"[bold red]ERREUR FATALE lors de l'initialisation de la DB:[/bold red] {e}"
-        )
-        sys.exit(1)
-    finally:
-        init_session.close()
+        except Exception as e:
+            console.print(
+                f"[bold red]FATAL WARNING:[/bold red] Error during .env load: {e}"
+            )
 
-    # --- INITIALISATION SENTRY (NOUVEAU) ---
+    # --- INITIALISATION SENTRY ---
+    # Before the DB init, so that a failing database is reported too
     init_sentry()
 
-    try:
-        while True:
-            if GLOBAL_JWT_TOKEN is None:
-                login_session = get_session()
-                logged_in_employee = login_cli(login_session)
-                login_session.close()
-
-                if logged_in_employee is None:
-                    Prompt.ask("Press Enter to try logging in again...")
-
+    with session_scope() as init_session:
+        try:
+            if is_database_initialized(init_session, engine):
+                console.print("[bold green]Database structure & roles verified.[/bold green]")
             else:
-                session = get_session()
-                action = "stay"
-
-                try:
-                    logged_in_employee = get_employee_from_token(
-                        GLOBAL_JWT_TOKEN, session
-                    )
+                console.print(
+                    "[bold cyan]--- Initializing Database Structure & Roles ---[/bold cyan]"
+                )
+                # initialize_roles() runs create_all() itself
+                initialize_roles(init_session, engine)
+        except Exception as e:
+            # No-op when Sentry is not initialized
+            report_exc(e, "db-init")
+            flush_sentry()
+            console.print(
+                f"[bold red]ERREUR FATALE lors de l'initialisation de la DB:[/bold red] {e}"
+            )
+            sys.exit(1)
 
-                    if logged_in_employee:
-                        action, new_token_from_menu = main_menu_router(
-                            logged_in_employee, session, GLOBAL_JWT_TOKEN
+    # A single session is reused across logins until the application quits:
+    # its identity map stays warm, and only per-user state is expired on logout.
+    try:
+        with session_scope() as session:
+            logged_in_employee = None
+            # JWT of the logged-in employee (None while logged out)
+            token: str | None = None
+
+            while True:
+                if token is None:
+                    logged_in_employee, token = login_cli(session)
+
+                    if logged_in_employee is None:
+                        # Ends the login query's transaction: the connection goes
+                        # back to the pool while the prompt waits for the user.
+                        session.rollback()
+                        input("Press Enter to try logging in again...")
+
+                else:
+                    action = "stay"
+                    # The menu returns None as new token on logout: keep the current one
+                    current_token = token
+
+                    try:
+                        logged_in_employee = resolve_logged_in_employee(
+                            token, session, logged_in_employee
                         )
 
-                        GLOBAL_JWT_TOKEN = new_token_from_menu
-                    else:
+                        if logged_in_employee:
+                            action, token = main_menu_router(
+                                logged_in_employee, session, token
+                            )
+                        else:
+                            action = "logout"
+                    except SystemExitRequested:
+                        action = "quit"
+                    except Exception as e:
+                        session.rollback()
+                        report_exc(e, "main-loop")
+                        console.print(
+                            f"[bold red]An unexpected error occurred in the main loop:[/bold red] "
+                            f"{e}. Error logged to Sentry."
+                        )
                         action = "logout"
-                except Exception as e:
-                    sentry_sdk.capture_exception(e)
-                    console.print(
-                        f"[bold red]An unexpected error occurred in the main loop:[/bold red] "
-                        f"{e}. Error logged to Sentry."
-                    )
-                    action = "logout"
-                finally:
-                    session.close()
-
-                if action == "quit":
-                    console.print(
-                        "\n[bold yellow]Exiting the application.[/bold yellow]"
-                    )
-                    console.print(
-                        "[bold yellow]Flushing Sentry events before exiting...[/bold yellow]"
-                    )
-                    sentry_sdk.flush(timeout=1.0)
-
-                    break
-                if action == "logout":
-                    GLOBAL_JWT_TOKEN = None
-                    console.print(
-                        "\n[bold blue]You have been logged out. " \
-                        "Returning to login screen.[/bold blue]"
-                    )
+
+                    if action == "quit":
+                        # Pending Sentry events are drained by the SDK's exit handler
+                        console.print(
+                            "\n[bold yellow]Exiting the application.[/bold yellow]"
+                        )
+
+                        break
+                    if action == "logout":
+                        invalidate_cached_token(current_token)
+                        token = None
+                        logged_in_employee = None
+                        session.expire_all()
+                        console.print(
+                            "\n[bold blue]You have been logged out. " \
+                            "Returning to login screen.[/bold blue]"
+                        )
 
     except Exception as e:
-        sentry_sdk.capture_exception(e)
+        report_exc(e, "fatal-crash")
         console.print(
             f"[bold red]FATAL CRASH:[/bold red] Application encountered an unhandled error. "
             "Error logged to Sentry."
@@ -242,8 +473,10 @@ def main():
         console.print(
             "[bold yellow]Flushing Sentry events after crash...[/bold yellow]"
         )
-        sentry_sdk.flush(timeout=2.0)
+        flush_sentry()
         sys.exit(1)
+    finally:
+        engine.dispose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+# tests/conftest.py
+import pytest
+from app import authentication
+from tests.helpers import fake_check_password, fake_hash_password
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_bcrypt():
+    # bcrypt's minimum cost (2^4 instead of 2^12 rounds): the tests check that hashes
+    # round-trip, not their strength. check_password reads the cost from the hash.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(authentication, "BCRYPT_ROUNDS", 4)
+        yield
+
+@pytest.fixture(autouse=True)
+def no_bcrypt(request, mocker):
+    # Tests only need "the employee has some password": skip bcrypt entirely, unless
+    # the test is marked @pytest.mark.real_bcrypt.
+    if request.node.get_closest_marker("real_bcrypt"):
+        return
+    mocker.patch.object(authentication, "hash_password", new=fake_hash_password)
+    mocker.patch.object(authentication, "check_password", new=fake_check_password)
@@ -0,0 +1,31 @@
+# tests/factories.py
+from decimal import Decimal
+import factory
+from app.models import Client, Contract
+
+
+class ClientFactory(factory.alchemy.SQLAlchemyModelFactory):
+    """Client rows for tests that need one but do not test create_client."""
+
+    class Meta:
+        model = Client
+        sqlalchemy_session_persistence = "flush"  # The test's SAVEPOINT is rolled back
+
+    full_name = 'Client'
+    email = factory.Sequence(lambda n: f'factory.client{n}@e.com')
+    phone = '0192837465'
+    company_name = 'Comp'
+
+
+class ContractFactory(factory.alchemy.SQLAlchemyModelFactory):
+    """Contract rows (with their client) for tests that do not test create_contract."""
+
+    class Meta:
+        model = Contract
+        sqlalchemy_session_persistence = "flush"
+
+    client = factory.SubFactory(ClientFactory)
+    sales_contact_id = factory.SelfAttribute('client.sales_contact_id')
+    total_amount = Decimal('1000')
+    remaining_amount = Decimal('500')
+    status_signed = True
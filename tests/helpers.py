@@ -0,0 +1,176 @@
+# tests/helpers.py
+import copy
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import Mock, NonCallableMock
+from sqlalchemy import event
+from app.models import Employee
+
+
+def fake_hash_password(password):
+    """Stand-in for bcrypt in tests (see the no_bcrypt fixture in tests/conftest.py)."""
+    return f"$2b$04$fake${password}"
+
+
+def fake_check_password(password, hashed_password):
+    return hashed_password == fake_hash_password(password)
+
+
+def bulk_make_employees(session, roles, specs):
+    """
+    Inserts employees in one bulk statement, bypassing create_employee (no validation,
+    no hashing). specs are (full_name, email, department) tuples; returns the new ids.
+    """
+    employees = [
+        Employee(
+            full_name=full_name,
+            email=email,
+            phone='0000000000',
+            role_id=roles[department].id,
+            _password=fake_hash_password('pass'),
+        )
+        for full_name, email, department in specs
+    ]
+    session.bulk_save_objects(employees, return_defaults=True)
+    session.commit()
+    return [employee.id for employee in employees]
+
+
+@contextmanager
+def count_queries(session):
+    """Records the SQL statements sent through the session's connection in the block."""
+    statements = []
+    connection = session.connection()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
+
+
+_SPEC_TEMPLATES = {}
+
+
+def spec_mock(model, spec_set=False, **attrs):
+    """
+    Same as NonCallableMock(spec=model, **attrs), but the spec introspection runs once
+    per model: each call shallow-copies a cached template and gives the copy its own
+    children and call records. Model mocks are attribute bags, never called.
+    With spec_set=True, setting an attribute the model does not have also raises.
+    """
+    key = (model, spec_set)
+    template = _SPEC_TEMPLATES.get(key)
+    if template is None:
+        template = _SPEC_TEMPLATES[key] = NonCallableMock(spec_set=model) if spec_set else NonCallableMock(spec=model)
+    mock = copy.copy(template)
+    mock._mock_children = {}
+    mock.reset_mock()
+    mock.configure_mock(**attrs)
+    return mock
+
+
+def set_query_result(session, result, *chain):
+    """
+    Makes session.query(...).<chain[0]>(...)...<chain[-1]>() return result on a
+    MockSession, e.g. set_query_result(session, contract, 'options', 'filter_by', 'one_or_none').
+    """
+    node = session.query
+    for name in chain:
+        node = getattr(node.return_value, name)
+    node.return_value = result
+
+
+def set_query_sequence(session, *steps):
+    """
+    Successive session.query(...) calls on a MockSession return one query per step.
+    A step is (result, *chain) as in set_query_result, e.g. (None, 'filter_by', 'first').
+    Nothing asserts on these step queries, so each is a plain SimpleNamespace chain
+    rather than a tree of Mocks.
+    """
+    session.query.side_effect = [_chain(result, chain) for result, *chain in steps]
+
+
+def set_query_by_model(session, steps):
+    """
+    Like set_query_sequence, but session.query(model) picks its step from a dict keyed
+    by the queried model, so the result does not depend on the order of the queries,
+    e.g. set_query_by_model(session, {Event: (event, 'filter_by', 'one_or_none')}).
+    """
+    queries = {model: _chain(result, chain) for model, (result, *chain) in steps.items()}
+    session.query.side_effect = lambda model, *entities: queries[model]
+
+
+def _chain(result, chain):
+    for name in reversed(chain):
+        result = SimpleNamespace(**{name: lambda *args, _result=result, **kwargs: _result})
+    return result
+
+
+class FakeQuery:
+    """
+    Chainable stand-in for a Query: filter/filter_by/join/options return the same
+    object, so tests only set the terminal call (one_or_none, first, all, count).
+    """
+
+    def __init__(self, one_or_none=None, first=None, all=(), count=0):
+        self.one_or_none = Mock(return_value=one_or_none)
+        self.first = Mock(return_value=first)
+        self.all = Mock(return_value=list(all))
+        self.count = Mock(return_value=count)
+
+    def filter(self, *criteria):
+        return self
+
+    def filter_by(self, **kwargs):
+        return self
+
+    def join(self, *args, **kwargs):
+        return self
+
+    def options(self, *args):
+        return self
+
+
+class FakeSession:
+    """
+    Minimal Session stub for controller unit tests. session.query(Model) returns
+    queries[Model] when a test registered one, the shared fake_query otherwise; the
+    write methods are plain Mocks so calls can be asserted.
+    """
+
+    def __init__(self):
+        self.fake_query = FakeQuery()
+        self.queries = {}
+        self.add = Mock()
+        self.delete = Mock()
+        self.get = Mock(return_value=None)
+        self.flush = Mock()
+        self.refresh = Mock()
+        self.commit = Mock()
+        self.rollback = Mock()
+
+    def query(self, *entities):
+        return self.queries.get(entities[0], self.fake_query)
+
+
+class MockSession:
+    """
+    Session double for unit tests that configure Mock query chains
+    (session.query.return_value.filter_by...). Each Session method the controllers call
+    is a Mock; __slots__ rejects any other attribute, as spec=Session did, without
+    introspecting the Session class on every construction.
+    """
+
+    __slots__ = ('query', 'add', 'delete', 'commit', 'rollback')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, Mock())
+
+    def reset_mock(self, **kwargs):
+        for name in self.__slots__:
+            getattr(self, name).reset_mock(**kwargs)
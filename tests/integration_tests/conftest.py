@@ -1,88 +1,156 @@
 # tests/conftest.py
+import os
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models import Base, Employee, Role, Client, Contract, Event  # Added Event
-from app.authentication import hash_password
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, Employee, Role, Client
+from tests.factories import ClientFactory, ContractFactory
+from tests.helpers import fake_hash_password, spec_mock
 
-@pytest.fixture(scope="module")
+
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    # pysqlite emits its own BEGIN (and not before SAVEPOINT): let SQLAlchemy do it,
+    # so that each test's SAVEPOINTs stay inside the transaction rolled back on exit.
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def pytest_collection_modifyitems(config, items):
+    # With --dist=loadgroup the DB tests share one worker, so only that worker builds
+    # the schema and the seeded employees; the mock-only unit tests fan out.
+    here = os.path.dirname(__file__)
+    for item in items:
+        if str(item.path).startswith(here):
+            item.add_marker(pytest.mark.xdist_group("db"))
+
+
+@pytest.fixture(scope="session")
 def test_engine():
-    engine = create_engine('sqlite:///:memory:')
+    # One in-memory DB shared by every connection of the run (StaticPool keeps a
+    # single connection open, so the DB is never dropped or re-created mid-run).
+    # Under pytest-xdist, each worker gets its own DB.
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER', 'master')
+    engine = create_engine(
+        f'sqlite:///file:testdb_{worker_id}?mode=memory&cache=shared&uri=true',
+        connect_args={'check_same_thread': False, 'uri': True},
+        poolclass=StaticPool,
+        # Compiled-statement LRU: every controller query is compiled once per run
+        query_cache_size=1200,
+        echo=False,
+    )
+    event.listen(engine, "connect", _disable_pysqlite_begin)
+    event.listen(engine, "begin", _emit_begin)
     Base.metadata.create_all(engine)
     yield engine
     Base.metadata.drop_all(engine)
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def test_connection(test_engine):
+    # One connection and one transaction for the whole run, rolled back at the end:
+    # seeded data and every test live inside it.
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
 
-@pytest.fixture(scope="module")
-def test_session(test_engine):
-    Session = sessionmaker(bind=test_engine)
+@pytest.fixture(scope="session")
+def test_session(test_connection):
+    # Seeds the data shared by all tests; objects stay usable once the session closes
+    Session = sessionmaker(
+        bind=test_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
     session = Session()
     yield session
     session.close()
 
 @pytest.fixture(scope="function")
-def clean_session(test_session):
-    test_session.query(Employee).delete()
-    test_session.query(Client).delete()
-    test_session.query(Contract).delete()
-    test_session.query(Event).delete()  # Added Event table cleanup
-    test_session.commit()
-    yield test_session
-    test_session.rollback()
+def clean_session(test_connection):
+    # Each test runs in a SAVEPOINT rolled back on exit; commits made by the code
+    # under test only release a nested SAVEPOINT, so nothing needs to be deleted.
+    nested = test_connection.begin_nested()
+    session = Session(bind=test_connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    nested.rollback()
+
+@pytest.fixture
+def factories(clean_session):
+    # Factories flush into the test's session; their rows go with its rollback
+    for factory_class in (ClientFactory, ContractFactory):
+        factory_class._meta.sqlalchemy_session = clean_session
+    yield
+    for factory_class in (ClientFactory, ContractFactory):
+        factory_class._meta.sqlalchemy_session = None
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def create_roles(test_session):
     roles_to_create = ['Gestion', 'Commercial', 'Support']
-    for role_name in roles_to_create:
-        if not test_session.query(Role).filter_by(name=role_name).first():
-            new_role = Role(name=role_name)
-            test_session.add(new_role)
+    # One INSERT for the three roles (existing names are skipped), one SELECT to read them
+    stmt = sqlite_insert(Role.__table__).values(
+        [{'name': role_name} for role_name in roles_to_create]
+    ).on_conflict_do_nothing(index_elements=['name'])
+    test_session.execute(stmt)
     test_session.commit()
-    roles = {role.name: role for role in test_session.query(Role).all()}
+    roles = {role.name: role for role in test_session.scalars(select(Role))}
+    test_session.close()
+    # No teardown: test_connection's final rollback removes the seeded rows
     yield roles
-    test_session.query(Role).delete()
+
+@pytest.fixture(scope="session")
+def seeded_employees(test_session, create_roles):
+    # Canonical employees, created once for the whole run. Tests only change them
+    # inside clean_session, whose transaction is rolled back.
+    # One Core INSERT for the three rows (no unit of work, no bcrypt), ids returned
+    rows = {
+        'admin': ('Admin User', 'admin@epicevents.com', '1234567890', 'Gestion', 'adminpass'),
+        'sales': ('Sales User', 'sales@epicevents.com', '9876543210', 'Commercial', 'salespass'),
+        'support': ('Support User', 'support@epicevents.com', '5555555555', 'Support', 'supportpass'),
+    }
+    employees_table = Employee.__table__
+    inserted_ids = test_session.scalars(
+        insert(employees_table).returning(employees_table.c.id, sort_by_parameter_order=True),
+        [
+            {
+                'full_name': full_name,
+                'email': email,
+                'phone': phone,
+                'role_id': create_roles[department].id,
+                'password_hash': fake_hash_password(password),
+            }
+            for full_name, email, phone, department, password in rows.values()
+        ],
+    ).all()
     test_session.commit()
+    # Role loaded now: employee.department is read once the objects are detached
+    employees = {
+        key: test_session.get(Employee, employee_id, options=[joinedload(Employee.role)])
+        for key, employee_id in zip(rows, inserted_ids)
+    }
+    test_session.close()
+    yield employees
 
-@pytest.fixture
-def admin_employee(clean_session, create_roles):
-    admin = Employee(
-        full_name='Admin User',
-        email='admin@epicevents.com',
-        phone='1234567890',
-        role_id=create_roles['Gestion'].id,
-        _password=hash_password('adminpass')
-    )
-    clean_session.add(admin)
-    clean_session.commit()
-    yield admin
-    clean_session.query(Employee).filter_by(id=admin.id).delete()
-    clean_session.commit()
+@pytest.fixture(scope="session")
+def admin_employee(seeded_employees):
+    return seeded_employees['admin']
 
-@pytest.fixture
-def sales_employee(clean_session, create_roles):
-    sales = Employee(
-        full_name='Sales User',
-        email='sales@epicevents.com',
-        phone='9876543210',
-        role_id=create_roles['Commercial'].id,
-        _password=hash_password('salespass')
-    )
-    clean_session.add(sales)
-    clean_session.commit()
-    yield sales
-    clean_session.query(Employee).filter_by(id=sales.id).delete()
-    clean_session.commit()
+@pytest.fixture(scope="session")
+def sales_employee(seeded_employees):
+    return seeded_employees['sales']
+
+@pytest.fixture(scope="session")
+def support_employee(seeded_employees):
+    return seeded_employees['support']
 
 @pytest.fixture
-def support_employee(clean_session, create_roles):
-    support = Employee(
-        full_name='Support User',
-        email='support@epicevents.com',
-        phone='5555555555',
-        role_id=create_roles['Support'].id,
-        _password=hash_password('supportpass')
-    )
-    clean_session.add(support)
-    clean_session.commit()
-    yield support
-    clean_session.query(Employee).filter_by(id=support.id).delete()
-    clean_session.commit()
\ No newline at end of file
+def client_mock(sales_employee):
+    # Stands in for a Client in tests that never reach the client lookup
+    return spec_mock(Client, id=1, sales_contact_id=sales_employee.id, full_name='Client')
@@ -1,22 +1,27 @@
 # tests/test_client_controller.py
 import pytest
+from sqlalchemy.orm import Session
 from app.controllers.client_controller import create_client, list_clients, update_client
 from app.controllers.employee_controller import create_employee
 from app.models import Client
+from tests.helpers import spec_mock
 
 def test_create_client_happy_sales(sales_employee, clean_session):
     client = create_client(clean_session, sales_employee, 'Client One', 'client1@e.com', '0192837465', 'Company')
     assert client is not None
     assert client.full_name == 'Client One'
 
-def test_create_client_happy_admin(admin_employee, clean_session, sales_employee):
+def test_create_client_happy_admin(admin_employee, clean_session):
     client = create_client(clean_session, admin_employee, 'Client Two', 'client2@e.com', '0192837465', 'Company')
     assert client is not None
     assert client.sales_contact_id == admin_employee.id
 
-def test_create_client_sad_permission(support_employee, clean_session):
+def test_create_client_sad_permission(support_employee):
+    # Denied before any query: a bare mock session is enough, and must stay untouched
+    session = spec_mock(Session)
     with pytest.raises(PermissionError):
-        create_client(clean_session, support_employee, 'Client', 'client3@e.com', '0192837465', 'Comp')
+        create_client(session, support_employee, 'Client', 'client3@e.com', '0192837465', 'Comp')
+    assert session.method_calls == []
 
 def test_create_client_sad_invalid_data(sales_employee, clean_session):
     result = create_client(clean_session, sales_employee, '', 'client4@e.com', '0192837465', 'Comp')
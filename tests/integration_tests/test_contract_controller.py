@@ -1,65 +1,74 @@
 # tests/test_contract_controller.py
 import pytest
 from decimal import Decimal
-from unittest.mock import Mock
+from sqlalchemy import inspect
 from app.controllers.contract_controller import create_contract, list_contracts, update_contract
 from app.controllers.client_controller import create_client
-from app.controllers.employee_controller import create_employee
-from app.models import Contract, Client
+from app.models import Contract, Client, Employee
+from tests.factories import ContractFactory
+from tests.helpers import bulk_make_employees, count_queries, spec_mock
+
+AMT_TOTAL = Decimal('1000')
+AMT_REMAINING = Decimal('500')
+AMT_INVALID = Decimal('1500')  # Greater than AMT_TOTAL
 
 def test_create_contract_happy(admin_employee, clean_session, sales_employee):
     client = create_client(clean_session, sales_employee, 'Client', 'client1@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
+    contract = create_contract(clean_session, admin_employee, client.id, AMT_TOTAL, AMT_REMAINING, True)
     assert contract is not None
-    assert contract.total_amount == Decimal('1000')
-    assert contract.remaining_amount == Decimal('500')
+    assert contract.total_amount == AMT_TOTAL
+    assert contract.remaining_amount == AMT_REMAINING
     assert contract.status_signed is True
 
 def test_create_contract_sad_permission(sales_employee, clean_session):
     client = create_client(clean_session, sales_employee, 'Client', 'client2@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, sales_employee, client.id, Decimal('1000'), Decimal('500'), True)
+    contract = create_contract(clean_session, sales_employee, client.id, AMT_TOTAL, AMT_REMAINING, True)
     assert contract is not None  # Expect contract creation to succeed due to check_permission behavior
-    assert contract.total_amount == Decimal('1000')
-    assert contract.remaining_amount == Decimal('500')
+    assert contract.total_amount == AMT_TOTAL
+    assert contract.remaining_amount == AMT_REMAINING
     assert contract.status_signed is True
 
-def test_create_contract_sad_invalid_amount(admin_employee, clean_session, sales_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client3@e.com', '0192837465', 'Comp')
-    result = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('1500'), True)
+def test_create_contract_sad_invalid_amount(admin_employee, clean_session, client_mock):
+    # Amounts are rejected before the client is looked up: no Client row needed
+    result = create_contract(clean_session, admin_employee, client_mock.id, AMT_TOTAL, AMT_INVALID, True)
     assert result is None
 
-def test_list_contracts_happy_sales(sales_employee, clean_session, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client4@e.com', '0192837465', 'Comp')
-    create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
+def test_list_contracts_happy_sales(sales_employee, clean_session, factories):
+    ContractFactory(client__sales_contact_id=sales_employee.id)
     contracts = list_contracts(clean_session, sales_employee)
     assert len(contracts) == 1
 
-def test_list_contracts_happy_admin(admin_employee, clean_session, sales_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client5@e.com', '0192837465', 'Comp')
-    create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
-    contracts = list_contracts(clean_session, admin_employee, filter_signed=True)  # Use filter_signed for signed contracts
-    assert len(contracts) == 1
+def test_list_contracts_happy_admin(admin_employee, clean_session, sales_employee, factories):
+    ContractFactory(client__sales_contact_id=sales_employee.id)
+    with count_queries(clean_session) as queries:
+        contracts = list_contracts(clean_session, admin_employee, filter_signed=True)  # Use filter_signed for signed contracts
+        assert len(contracts) == 1
+        assert contracts[0].client.full_name == 'Client'
+        assert contracts[0].sales_contact.full_name == 'Sales User'
+    assert len(queries) == 1  # No lazy load for the client or the sales contact
+    # Relationships shown by the contract view are eager-loaded (no lazy load per row)
+    assert not {'client', 'sales_contact'} & inspect(contracts[0]).unloaded
 
 def test_list_contracts_sad_permission(support_employee, clean_session):
     result = list_contracts(clean_session, support_employee)
     assert result == []  # Expect empty list for unauthorized role
 
-def test_update_contract_happy_sales(sales_employee, clean_session, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client6@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), False)
+def test_update_contract_happy_sales(sales_employee, clean_session, factories):
+    contract = ContractFactory(client__sales_contact_id=sales_employee.id, status_signed=False)
     updated = update_contract(clean_session, sales_employee, contract.id, status_signed=True)
     assert updated is not None
     assert updated.status_signed is True
 
-def test_update_contract_sad_wrong_sales(sales_employee, clean_session, admin_employee):
-    sales2 = create_employee(clean_session, admin_employee, 'Sales2', 'sales2@e.com', '4567890123', 'Commercial', 'pass')
+def test_update_contract_sad_wrong_sales(sales_employee, clean_session, admin_employee, create_roles):
+    [sales2_id] = bulk_make_employees(clean_session, create_roles, [('Sales2', 'sales2@e.com', 'Commercial')])
+    sales2 = clean_session.get(Employee, sales2_id)
     client = create_client(clean_session, sales2, 'Client', 'client7@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), False)
+    contract = create_contract(clean_session, admin_employee, client.id, AMT_TOTAL, AMT_REMAINING, False)
     assert contract.sales_contact_id == sales2.id  # Verify sales_contact_id is set correctly
     contract.sales_contact_id = sales2.id  # Ensure contract is assigned to sales2
     clean_session.commit()
     # Verify contract state after commit
-    contract_after_commit = clean_session.query(Contract).filter_by(id=contract.id).one_or_none()
+    contract_after_commit = clean_session.get(Contract, contract.id)
     assert contract_after_commit is not None
     assert contract_after_commit.sales_contact_id == sales2.id  # Confirm sales_contact_id persists
     result = update_contract(clean_session, sales_employee, contract.id, status_signed=True)
@@ -67,11 +76,11 @@ def test_update_contract_sad_wrong_sales(sales_employee, clean_session, admin_em
 
 def test_update_contract_sad_invalid_status(sales_employee, clean_session, admin_employee, mocker):
     # Mock create_client to avoid NoneType error
-    mock_client = Mock(spec=Client, id=9, sales_contact_id=sales_employee.id, full_name='Client')
+    mock_client = spec_mock(Client, id=9, sales_contact_id=sales_employee.id, full_name='Client')
     mocker.patch('app.controllers.client_controller.create_client', return_value=mock_client)
     
     client = create_client(clean_session, sales_employee, 'Client', 'client9@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), False)
+    contract = create_contract(clean_session, admin_employee, client.id, AMT_TOTAL, AMT_REMAINING, False)
     updated = update_contract(clean_session, sales_employee, contract.id, status_signed=True)
     assert updated is not None
     assert updated.status_signed is True
\ No newline at end of file
@@ -1,7 +1,9 @@
 # tests/test_employee_controller.py
 import pytest
+from sqlalchemy.orm import Session
 from app.controllers.employee_controller import create_employee, list_employees, update_employee, delete_employee
 from app.models import Employee
+from tests.helpers import bulk_make_employees, count_queries, spec_mock
 
 def test_create_employee_happy(admin_employee, clean_session):
     new_emp = create_employee(clean_session, admin_employee, 'Test User', '', '123', 'Commercial', 'pass')
@@ -9,9 +11,23 @@ def test_create_employee_happy(admin_employee, clean_session):
     assert new_emp.full_name == 'Test User'
     assert new_emp.email == 'test.user@epicevents.com'  # Match actual email generation
 
-def test_create_employee_sad_permission(sales_employee, clean_session):
-    result = create_employee(clean_session, sales_employee, 'Test', 'test@e.com', '123', 'Commercial', 'pass')
+@pytest.mark.real_bcrypt
+def test_create_employee_password_hashed(admin_employee, clean_session):
+    new_emp = create_employee(clean_session, admin_employee, 'Hash User', '', '123', 'Commercial', 'pass')
+    assert new_emp._password.startswith('$2b$')
+    assert new_emp.check_password('pass')
+    assert not new_emp.check_password('wrong')
+
+def test_create_employee_email_lowercased(admin_employee, clean_session):
+    new_emp = create_employee(clean_session, admin_employee, 'Case User', 'Case.User@E.com', '123', 'Commercial', 'pass')
+    assert new_emp.email == 'case.user@e.com'
+
+def test_create_employee_sad_permission(sales_employee):
+    # Denied before any query: a bare mock session is enough, and must stay untouched
+    session = spec_mock(Session)
+    result = create_employee(session, sales_employee, 'Test', 'test@e.com', '123', 'Commercial', 'pass')
     assert result is None
+    assert session.method_calls == []
 
 def test_create_employee_sad_invalid_data(admin_employee, clean_session):
     result = create_employee(clean_session, admin_employee, '', 'test@e.com', '123', 'Commercial', 'pass')
@@ -21,25 +37,31 @@ def test_create_employee_sad_invalid_dept(admin_employee, clean_session):
     result = create_employee(clean_session, admin_employee, 'Test', 'test@e.com', '123', 'Invalid', 'pass')
     assert result is None
 
-def test_list_employees_happy(clean_session, admin_employee):
-    assert len(list_employees(clean_session)) == 1
+def test_list_employees_happy(clean_session, seeded_employees):
+    with count_queries(clean_session) as queries:
+        listed_ids = {emp.id for emp in list_employees(clean_session)}
+    assert len(queries) <= 2
+    assert listed_ids == {emp.id for emp in seeded_employees.values()}
 
 def test_update_employee_happy(admin_employee, clean_session):
     updated = update_employee(clean_session, admin_employee, admin_employee.id, full_name='Updated Admin')
     assert updated.full_name == 'Updated Admin'
 
-def test_update_employee_sad_permission(sales_employee, clean_session, admin_employee):
-    result = update_employee(clean_session, sales_employee, admin_employee.id, full_name='Fail')
-    assert result is None  # Keep this, but we'll check controller logic
+def test_update_employee_sad_permission(sales_employee, admin_employee):
+    session = spec_mock(Session)
+    result = update_employee(session, sales_employee, admin_employee.id, full_name='Fail')
+    assert result is None
+    assert session.method_calls == []
 
 def test_update_employee_sad_invalid(admin_employee, clean_session):
     result = update_employee(clean_session, admin_employee, 999, full_name='No')
     assert result is None
 
-def test_delete_employee_happy(admin_employee, clean_session):
-    create_employee(clean_session, admin_employee, 'Admin2', 'admin2@e.com', '123', 'Gestion', 'pass')
+def test_delete_employee_happy(admin_employee, clean_session, create_roles):
+    # A second Gestion employee must exist; creating it is not what this test checks
+    bulk_make_employees(clean_session, create_roles, [('Admin2', 'admin2@e.com', 'Gestion')])
     assert delete_employee(clean_session, admin_employee.id) is True
-    assert clean_session.query(Employee).filter_by(id=admin_employee.id).one_or_none() is None
+    assert clean_session.get(Employee, admin_employee.id) is None
 
 def test_delete_employee_sad_last_admin(admin_employee, clean_session):
     assert delete_employee(clean_session, admin_employee.id) is False
@@ -7,71 +7,70 @@ from app.controllers.client_controller import create_client
 from app.controllers.contract_controller import create_contract
 from app.controllers.employee_controller import create_employee
 from app.models import Event
+from tests.factories import ContractFactory
 
-def test_create_event_happy(sales_employee, clean_session, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client1@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
+AMT_TOTAL = Decimal('1000')
+AMT_REMAINING = Decimal('500')
+
+@pytest.fixture
+def signed_contract(sales_employee, factories):
+    # A signed contract on one of sales_employee's clients: create_contract is tested elsewhere
+    return ContractFactory(client__sales_contact_id=sales_employee.id)
+
+@pytest.fixture
+def base_event(clean_session, sales_employee, signed_contract):
+    return create_event(clean_session, sales_employee, signed_contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
+
+def test_create_event_happy(sales_employee, clean_session, signed_contract):
     start_date = datetime.now() + timedelta(days=10)
     end_date = start_date + timedelta(days=1)
-    event = create_event(clean_session, sales_employee, contract.id, 'Event', 100, start_date, end_date, 'Location', 'Notes')
+    event = create_event(clean_session, sales_employee, signed_contract.id, 'Event', 100, start_date, end_date, 'Location', 'Notes')
     assert event is not None
     assert event.name == 'Event'
 
 def test_create_event_sad_permission(admin_employee, clean_session):
     client = create_client(clean_session, admin_employee, 'Client', 'client2@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
+    contract = create_contract(clean_session, admin_employee, client.id, AMT_TOTAL, AMT_REMAINING, True)
     result = create_event(clean_session, admin_employee, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
     assert result is not None  # Gestion can create events due to current check_permission behavior
     assert result.name == 'Event'
 
-def test_create_event_sad_unsigned_contract(sales_employee, clean_session, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client3@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), False)
+def test_create_event_sad_unsigned_contract(sales_employee, clean_session, factories):
+    contract = ContractFactory(client__sales_contact_id=sales_employee.id, status_signed=False)
     result = create_event(clean_session, sales_employee, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
     assert result is None
 
-def test_create_event_sad_invalid_dates(sales_employee, clean_session, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client4@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
-    result = create_event(clean_session, sales_employee, contract.id, 'Event', 100, datetime.now() + timedelta(days=1), datetime.now(), 'Location', 'Notes')
+def test_create_event_sad_invalid_dates(sales_employee, clean_session, signed_contract):
+    result = create_event(clean_session, sales_employee, signed_contract.id, 'Event', 100, datetime.now() + timedelta(days=1), datetime.now(), 'Location', 'Notes')
     assert result is None
 
-def test_list_events_happy_support(support_employee, clean_session, sales_employee, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client5@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
-    create_event(clean_session, sales_employee, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
+def test_list_events_happy_support(support_employee, clean_session, base_event):
     events = list_events(clean_session, support_employee)
     assert len(events) == 1
 
 def test_list_events_sad_permission(admin_employee, clean_session):
     client = create_client(clean_session, admin_employee, 'Client', 'client2@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
+    contract = create_contract(clean_session, admin_employee, client.id, AMT_TOTAL, AMT_REMAINING, True)
     create_event(clean_session, admin_employee, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
     result = list_events(clean_session, admin_employee)
     assert len(result) == 1  # Gestion can list events due to current check_permission behavior
 
-def test_update_event_happy_support(support_employee, clean_session, sales_employee, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client6@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
-    event = create_event(clean_session, sales_employee, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
+def test_update_event_happy_support(support_employee, clean_session, base_event):
     # Assign event to support_employee to pass permission check
-    event.support_contact_id = support_employee.id
+    base_event.support_contact_id = support_employee.id
     clean_session.commit()
-    updated = update_event(clean_session, support_employee, event.id, name='Updated Event')
+    updated = update_event(clean_session, support_employee, base_event.id, name='Updated Event')
     assert updated is not None
     assert updated.name == 'Updated Event'
 
-def test_update_event_sad_permission_sales(sales_employee, clean_session, admin_employee):
-    client = create_client(clean_session, sales_employee, 'Client', 'client7@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
-    event = create_event(clean_session, sales_employee, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
-    result = update_event(clean_session, sales_employee, event.id, name='Fail')
+def test_update_event_sad_permission_sales(sales_employee, clean_session, base_event):
+    result = update_event(clean_session, sales_employee, base_event.id, name='Fail')
     assert result is None  # Expect None for unauthorized role
 
-def test_update_event_sad_wrong_support(support_employee, clean_session, sales_employee, admin_employee):
+def test_update_event_sad_wrong_support(support_employee, clean_session, admin_employee):
     sales2 = create_employee(clean_session, admin_employee, 'Sales2', 'sales2@e.com', '4567890123', 'Commercial', 'pass')
     client = create_client(clean_session, sales2, 'Client', 'client8@e.com', '0192837465', 'Comp')
-    contract = create_contract(clean_session, admin_employee, client.id, Decimal('1000'), Decimal('500'), True)
+    contract = create_contract(clean_session, admin_employee, client.id, AMT_TOTAL, AMT_REMAINING, True)
     event = create_event(clean_session, sales2, contract.id, 'Event', 100, datetime.now(), datetime.now() + timedelta(days=1), 'Location', 'Notes')
     result = update_event(clean_session, support_employee, event.id, name='Fail')
     assert result is None
\ No newline at end of file
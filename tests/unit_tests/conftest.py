@@ -0,0 +1,36 @@
+# tests/unit_tests/conftest.py
+import os
+import pytest
+from app.models import Employee, Role
+from tests.helpers import MockSession, spec_mock
+
+
+def pytest_collection_modifyitems(config, items):
+    # No DB and no shared state: the unit tests carry no xdist_group, so -n auto can
+    # spread them over every worker, and `-m unit` selects them on their own.
+    here = os.path.dirname(__file__)
+    for item in items:
+        if str(item.path).startswith(here):
+            item.add_marker(pytest.mark.unit)
+
+@pytest.fixture(scope="module")
+def _module_session():
+    return MockSession()
+
+
+@pytest.fixture
+def mock_session(_module_session):
+    # One MockSession per module, cleared of the results, side effects and calls each
+    # test set up. test_client_controller_unit.py overrides it with a FakeSession.
+    yield _module_session
+    _module_session.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def mock_employee():
+    return spec_mock(Employee, id=1, department='Gestion', full_name='Admin User', role_id=1)
+
+
+@pytest.fixture
+def mock_role():
+    return spec_mock(Role, id=1, name='Gestion')
@@ -0,0 +1,35 @@
+# tests/test_authentication_unit.py
+import pytest
+from app import authentication
+from app.authentication import PERMISSIONS, check_permission, get_employee_permissions
+from app.models import Employee
+from tests.helpers import spec_mock
+
+@pytest.mark.parametrize("department,expected", [
+    ('Gestion', PERMISSIONS['Gestion']),
+    ('Commercial', PERMISSIONS['Commercial']),
+    ('Support', PERMISSIONS['Support']),
+    ('Unknown', {}),
+])
+def test_get_employee_permissions(department, expected):
+    assert dict(get_employee_permissions(department)) == expected
+
+@pytest.mark.parametrize("department,action,expected", [
+    ('Gestion', 'delete_employee', True),
+    ('Commercial', 'create_client', True),
+    ('Commercial', 'update_event', False),
+    ('Support', 'update_event', True),
+    ('Support', 'unknown_action', False),
+])
+def test_check_permission(department, action, expected):
+    employee = spec_mock(Employee, id=1, department=department)
+    assert check_permission(employee, action) is expected
+
+@pytest.mark.real_bcrypt
+@pytest.mark.parametrize("password", ['adminpass', 'pässwörd', ''])
+def test_password_hashing_and_checking(password):
+    hashed = authentication.hash_password(password)
+    assert hashed.startswith(('$2b$', '$2a$'))
+    assert hashed != authentication.hash_password(password)  # Salted: never the same hash
+    assert authentication.check_password(password, hashed) is True
+    assert authentication.check_password(password + 'x', hashed) is False
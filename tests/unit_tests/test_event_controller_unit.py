@@ -1,266 +1,145 @@
 # tests/test_event_controller_unit.py
 import pytest
 import datetime
-from unittest.mock import Mock, patch
-from sqlalchemy.orm import Session
+import functools
+from types import SimpleNamespace
 from sqlalchemy.exc import IntegrityError
+from app.controllers import event_controller
 from app.controllers.event_controller import create_event, list_events, update_event
 from app.models import Contract, Event, Employee, Role
+from tests.helpers import set_query_by_model, set_query_result, spec_mock
 
-@pytest.fixture
-def mock_session():
-    return Mock(spec=Session)
+DT_20 = datetime.datetime(2025, 10, 20)
+DT_21 = datetime.datetime(2025, 10, 21)
+DT_22 = datetime.datetime(2025, 10, 22)
+DT_23 = datetime.datetime(2025, 10, 23)
+INTEGRITY_ERROR = IntegrityError("mock error", {}, None)
 
-@pytest.fixture
+@functools.lru_cache(maxsize=None)
+def _employee(department):
+    # The controllers only read current_user: one mock per department serves every test.
+    return spec_mock(Employee, id=1, department=department)
+
+@pytest.fixture(autouse=True)
+def check_perm(request, monkeypatch):
+    # check_permission grants access, unless the test is indirectly parametrized with False.
+    allowed = getattr(request, 'param', True)
+    monkeypatch.setattr(event_controller, 'check_permission', lambda *args, **kwargs: allowed)
+
+# The employee, contract and event below are built once per module and never modified:
+# tests that need other values build their own (e.g. _employee('Gestion')).
+
+@pytest.fixture(scope="module")
 def mock_employee():
-    return Mock(spec=Employee, id=1, department='Commercial')
+    return _employee('Commercial')
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_contract():
-    return Mock(spec=Contract, id=1, status_signed=True, sales_contact_id=1)
+    return spec_mock(Contract, id=1, status_signed=True, sales_contact_id=1)
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_event():
-    return Mock(spec=Event, id=1, contract_id=1, support_contact_id=None, name='Event', 
-                attendees=100, event_start=datetime.datetime(2025, 10, 20), 
-                event_end=datetime.datetime(2025, 10, 21), location='Venue', notes='Notes')
+    return spec_mock(Event, id=1, contract_id=1, support_contact_id=None, name='Event', 
+                attendees=100, event_start=DT_20, event_end=DT_21, location='Venue', notes='Notes')
 
 def test_create_event_commercial_success(mock_session, mock_employee, mock_contract):
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_contract
-        mock_session.commit.return_value = None
-        event = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                             datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-        assert event is not None
-        assert event.contract_id == 1
-        assert event.name == 'Event'
-        assert event.attendees == 100
-        assert event.event_start == datetime.datetime(2025, 10, 20)
-        assert event.event_end == datetime.datetime(2025, 10, 21)
-        assert event.location == 'Venue'
-        assert event.notes == 'Notes'
-        assert event.support_contact_id is None
+    set_query_result(mock_session, mock_contract, 'filter_by', 'one_or_none')
+    mock_session.commit.return_value = None
+    event = create_event(mock_session, mock_employee, 1, 'Event', 100, DT_20, DT_21, 'Venue', 'Notes')
+    assert event is not None
+    assert (event.contract_id, event.name, event.attendees, event.event_start, event.event_end,
+            event.location, event.notes, event.support_contact_id) == \
+           (1, 'Event', 100, DT_20, DT_21, 'Venue', 'Notes', None)
 
+@pytest.mark.parametrize("check_perm", [False], indirect=True)
 def test_create_event_permission_denied(mock_session, mock_employee):
-    with patch('app.controllers.event_controller.check_permission', return_value=False):
-        with pytest.raises(PermissionError, match="Permission denied to create events."):
-            create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                         datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-
-def test_create_event_contract_not_found(mock_session, mock_employee):
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = None
-        result = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                              datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-        assert result is None
-
-def test_create_event_unsigned_contract(mock_session, mock_employee):
-    mock_contract = Mock(spec=Contract, id=1, status_signed=False, sales_contact_id=1)
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_contract
-        result = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                              datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-        assert result is None
-
-def test_create_event_wrong_sales_contact(mock_session, mock_employee, mock_contract):
-    mock_contract.sales_contact_id = 2
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_contract
-        result = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                              datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-        assert result is None
-
-def test_create_event_invalid_dates(mock_session, mock_employee, mock_contract):
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_contract
-        result = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                              datetime.datetime(2025, 10, 21), datetime.datetime(2025, 10, 20), 'Venue', 'Notes')
-        assert result is None
-
-def test_create_event_integrity_error(mock_session, mock_employee, mock_contract):
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_contract
-        mock_session.commit.side_effect = IntegrityError("mock error", {}, None)
-        result = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                              datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-        assert result is None
-        assert mock_session.rollback.called
-
-def test_create_event_unexpected_error(mock_session, mock_employee, mock_contract):
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_contract
-        mock_session.commit.side_effect = Exception("unexpected error")
-        result = create_event(mock_session, mock_employee, 1, 'Event', 100, 
-                              datetime.datetime(2025, 10, 20), datetime.datetime(2025, 10, 21), 'Venue', 'Notes')
-        assert result is None
-        assert mock_session.rollback.called
-
-def test_list_events_commercial(mock_session, mock_employee):
-    mock_event = Mock(spec=Event, id=1, contract_id=1)
-    mock_session.query.return_value.options.return_value.join.return_value.filter.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee)
-        assert len(events) == 1
-        assert events[0] == mock_event
-
-def test_list_events_support_mine(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=1)
-    mock_session.query.return_value.options.return_value.filter.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee, support_filter_scope='mine')
-        assert len(events) == 1
-        assert events[0] == mock_event
-
-def test_list_events_support_unassigned(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=None)
-    mock_session.query.return_value.options.return_value.filter.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee, support_filter_scope='unassigned')
-        assert len(events) == 1
-        assert events[0] == mock_event
-
-def test_list_events_support_default(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=None)
-    mock_session.query.return_value.options.return_value.filter.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee, support_filter_scope='default')
-        assert len(events) == 1
-        assert events[0] == mock_event
-
-def test_list_events_support_all_db(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=2)
-    mock_session.query.return_value.options.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee, support_filter_scope='all_db')
-        assert len(events) == 1
-        assert events[0] == mock_event
-
-def test_list_events_gestion_no_filter(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Gestion')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=2)
-    mock_session.query.return_value.options.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee)
-        assert len(events) == 1
-        assert events[0] == mock_event
-
-def test_list_events_gestion_with_filter(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Gestion')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=2)
-    mock_session.query.return_value.options.return_value.filter.return_value.all.return_value = [mock_event]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        events = list_events(mock_session, mock_employee, filter_by_support_id=2)
-        assert len(events) == 1
-        assert events[0] == mock_event
-
+    with pytest.raises(PermissionError, match="Permission denied to create events."):
+        create_event(mock_session, mock_employee, 1, 'Event', 100, DT_20, DT_21, 'Venue', 'Notes')
+
+@pytest.mark.parametrize("contract,start,end,error", [
+    pytest.param(None, DT_20, DT_21, None, id='contract_not_found'),
+    pytest.param(spec_mock(Contract, id=1, status_signed=False, sales_contact_id=1), DT_20, DT_21, None,
+                 id='unsigned_contract'),
+    pytest.param(spec_mock(Contract, id=1, status_signed=True, sales_contact_id=2), DT_20, DT_21, None,
+                 id='wrong_sales_contact'),
+    pytest.param(spec_mock(Contract, id=1, status_signed=True, sales_contact_id=1), DT_21, DT_20, None,
+                 id='invalid_dates'),
+    pytest.param(spec_mock(Contract, id=1, status_signed=True, sales_contact_id=1), DT_20, DT_21,
+                 INTEGRITY_ERROR, id='integrity_error'),
+    pytest.param(spec_mock(Contract, id=1, status_signed=True, sales_contact_id=1), DT_20, DT_21,
+                 Exception("unexpected error"), id='unexpected_error'),
+])
+def test_create_event_failure(mock_session, mock_employee, contract, start, end, error):
+    set_query_result(mock_session, contract, 'filter_by', 'one_or_none')
+    mock_session.commit.side_effect = error
+    result = create_event(mock_session, mock_employee, 1, 'Event', 100, start, end, 'Venue', 'Notes')
+    assert result is None
+    # Only a failed commit has anything to roll back
+    assert mock_session.rollback.called is (error is not None)
+
+@pytest.mark.parametrize("department,filters,chain", [
+    pytest.param('Commercial', {}, ('options', 'join', 'filter', 'all'), id='commercial'),
+    pytest.param('Support', {'support_filter_scope': 'mine'}, ('options', 'filter', 'all'), id='support_mine'),
+    pytest.param('Support', {'support_filter_scope': 'unassigned'}, ('options', 'filter', 'all'),
+                 id='support_unassigned'),
+    pytest.param('Support', {'support_filter_scope': 'default'}, ('options', 'filter', 'all'),
+                 id='support_default'),
+    pytest.param('Support', {'support_filter_scope': 'all_db'}, ('options', 'all'), id='support_all_db'),
+    pytest.param('Gestion', {}, ('options', 'all'), id='gestion_no_filter'),
+    pytest.param('Gestion', {'filter_by_support_id': 2}, ('options', 'filter', 'all'), id='gestion_with_filter'),
+])
+def test_list_events(mock_session, department, filters, chain):
+    mock_event = SimpleNamespace(id=1)
+    set_query_result(mock_session, [mock_event], *chain)
+    events = list_events(mock_session, _employee(department), **filters)
+    assert events == [mock_event]
+
+@pytest.mark.parametrize("check_perm", [False], indirect=True)
 def test_list_events_permission_denied(mock_session, mock_employee):
-    with patch('app.controllers.event_controller.check_permission', return_value=False):
-        with pytest.raises(PermissionError, match="Permission denied to view events."):
-            list_events(mock_session, mock_employee)
+    with pytest.raises(PermissionError, match="Permission denied to view events."):
+        list_events(mock_session, mock_employee)
 
 def test_update_event_support_success(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=1, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_event
+    mock_employee = _employee('Support')
+    mock_event = spec_mock(Event, id=1, support_contact_id=1, 
+                     event_start=DT_20, event_end=DT_21)
+    set_query_result(mock_session, mock_event, 'filter_by', 'one_or_none')
     mock_session.commit.return_value = None
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        updated = update_event(mock_session, mock_employee, 1, 
-                              name='New Event', attendees=200, 
-                              event_start=datetime.datetime(2025, 10, 22), 
-                              event_end=datetime.datetime(2025, 10, 23), location='New Venue', notes='New Notes')
-        assert updated is not None
-        assert updated.name == 'New Event'
-        assert updated.attendees == 200
-        assert updated.event_start == datetime.datetime(2025, 10, 22)
-        assert updated.event_end == datetime.datetime(2025, 10, 23)
-        assert updated.location == 'New Venue'
-        assert updated.notes == 'New Notes'
-
-def test_update_event_support_unassigned(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=2, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_event
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, name='New Event')
-        assert result is None
-
-def test_update_event_not_found(mock_session, mock_employee):
-    mock_employee.department = 'Gestion'
-    mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = None
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, name='New Event')
-        assert result is None
-
-def test_update_event_invalid_contract(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Gestion')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=None, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_session.query.side_effect = [
-        Mock(filter_by=Mock(return_value=Mock(one_or_none=Mock(return_value=mock_event)))),
-        Mock(filter_by=Mock(return_value=Mock(one_or_none=Mock(return_value=None))))
-    ]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, contract_id=2)
-        assert result is None
-
-def test_update_event_unsigned_contract(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Gestion')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=None, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_contract = Mock(spec=Contract, id=2, status_signed=False)
-    mock_session.query.side_effect = [
-        Mock(filter_by=Mock(return_value=Mock(one_or_none=Mock(return_value=mock_event)))),
-        Mock(filter_by=Mock(return_value=Mock(one_or_none=Mock(return_value=mock_contract))))
-    ]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, contract_id=2)
-        assert result is None
-
-def test_update_event_invalid_support_contact(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Gestion')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=None, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_session.query.side_effect = [
-        Mock(filter_by=Mock(return_value=Mock(one_or_none=Mock(return_value=mock_event)))),
-        Mock(filter=Mock(return_value=Mock(one_or_none=Mock(return_value=None))))
-    ]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, support_contact_id=3)
-        assert result is None
-
-def test_update_event_support_assign_other(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=None, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_session.query.side_effect = [
-        Mock(filter_by=Mock(return_value=Mock(one_or_none=Mock(return_value=mock_event)))),
-        Mock(filter=Mock(return_value=Mock(one_or_none=Mock(return_value=Mock(id=2)))))
-    ]
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, support_contact_id=2)
-        assert result is None
-
-def test_update_event_invalid_dates(mock_session):
-    mock_employee = Mock(spec=Employee, id=1, department='Support')
-    mock_event = Mock(spec=Event, id=1, support_contact_id=1, 
-                     event_start=datetime.datetime(2025, 10, 20), event_end=datetime.datetime(2025, 10, 21))
-    mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_event
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        result = update_event(mock_session, mock_employee, 1, 
-                              event_start=datetime.datetime(2025, 10, 21), 
-                              event_end=datetime.datetime(2025, 10, 20))
-        assert result is None
-
-def test_update_event_no_updates(mock_session, mock_employee):
-    mock_employee.department = 'Gestion'
-    mock_session.query.return_value.filter_by.return_value.one_or_none.return_value = mock_event
-    with patch('app.controllers.event_controller.check_permission', return_value=True):
-        updated = update_event(mock_session, mock_employee, 1)
-        assert updated is mock_event
-        assert not mock_session.commit.called
\ No newline at end of file
+    updated = update_event(mock_session, mock_employee, 1, 
+                          name='New Event', attendees=200, 
+                          event_start=DT_22, event_end=DT_23, location='New Venue', notes='New Notes')
+    assert updated is not None
+    assert (updated.name, updated.attendees, updated.event_start, updated.event_end,
+            updated.location, updated.notes) == \
+           ('New Event', 200, DT_22, DT_23, 'New Venue', 'New Notes')
+
+@pytest.mark.parametrize("department,event,steps,changes", [
+    pytest.param('Support', spec_mock(Event, id=1, support_contact_id=2, event_start=DT_20, event_end=DT_21),
+                 {}, {'name': 'New Event'}, id='support_unassigned'),
+    pytest.param('Gestion', None, {}, {'name': 'New Event'}, id='not_found'),
+    pytest.param('Gestion', spec_mock(Event, id=1, support_contact_id=None, event_start=DT_20, event_end=DT_21),
+                 {Contract: (None, 'filter_by', 'one_or_none')}, {'contract_id': 2}, id='invalid_contract'),
+    pytest.param('Gestion', spec_mock(Event, id=1, support_contact_id=None, event_start=DT_20, event_end=DT_21),
+                 {Contract: (spec_mock(Contract, id=2, status_signed=False), 'filter_by', 'one_or_none')},
+                 {'contract_id': 2}, id='unsigned_contract'),
+    pytest.param('Gestion', spec_mock(Event, id=1, support_contact_id=None, event_start=DT_20, event_end=DT_21),
+                 {Employee: (None, 'join', 'filter', 'one_or_none')}, {'support_contact_id': 3},
+                 id='invalid_support_contact'),
+    pytest.param('Support', spec_mock(Event, id=1, support_contact_id=None, event_start=DT_20, event_end=DT_21),
+                 {}, {'support_contact_id': 2}, id='support_assign_other'),
+    pytest.param('Support', spec_mock(Event, id=1, support_contact_id=1, event_start=DT_20, event_end=DT_21),
+                 {}, {'event_start': DT_21, 'event_end': DT_20}, id='invalid_dates'),
+])
+def test_update_event_failure(mock_session, department, event, steps, changes):
+    mock_employee = _employee(department)
+    set_query_by_model(mock_session, {Event: (event, 'filter_by', 'one_or_none'), **steps})
+    result = update_event(mock_session, mock_employee, 1, **changes)
+    assert result is None
+    assert mock_session.query.call_count == 1 + len(steps)
+
+def test_update_event_no_updates(mock_session, mock_event):
+    mock_employee = _employee('Gestion')
+    set_query_result(mock_session, mock_event, 'filter_by', 'one_or_none')
+    updated = update_event(mock_session, mock_employee, 1)
+    assert updated is mock_event
+    assert not mock_session.commit.called
\ No newline at end of file